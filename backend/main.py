@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Set
 from contextlib import asynccontextmanager
@@ -9,26 +10,55 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Requ
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 import redis.asyncio as aioredis
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import os
 from dotenv import load_dotenv
 
 from sheets_service import SheetsService
 from clients_service import ClientsService
+from snapshot_service import SnapshotService
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+SNAPSHOT_KEY = "entries_snapshot"
+SYNC_WAIT_TIMEOUT = 30
+SHEETS_RETRY_MAX = 300
+
 redis_client: Optional[aioredis.Redis] = None
 sheets_service: Optional[SheetsService] = None
 clients_service: Optional[ClientsService] = None
+snapshot_service: Optional[SnapshotService] = None
+cached_entries: Optional[Dict] = None
+redis_snapshot_dump: Optional[str] = None
+# Выставляется после первой успешной сверки с Sheets: до неё row_idx из снапшота могут быть устаревшими
+sheets_synced = asyncio.Event()
 active_connections: Set[WebSocket] = set()
 
+# Метрики холодного старта (мс от запуска процесса)
+startup_started = time.monotonic()
+startup_metrics: Dict = {
+    "snapshot_source": None,
+    "snapshot_periods": 0,
+    "ready_ms": None,
+    "first_byte_ms": None,
+    "sheets_ready_ms": None,
+    "first_sync_ms": None,
+}
+
+def elapsed_ms() -> float:
+    return round((time.monotonic() - startup_started) * 1000, 1)
+
+def mark_first_byte(kind: str):
+    if startup_metrics["first_byte_ms"] is None:
+        startup_metrics["first_byte_ms"] = elapsed_ms()
+        logger.info(f"⏱ Time-to-first-byte ({kind}): {startup_metrics['first_byte_ms']} мс")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global redis_client, sheets_service, clients_service
+    global redis_client, clients_service, snapshot_service
     
     try:
         redis_client = await aioredis.from_url(
@@ -39,11 +69,8 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Redis: {e}")
     
-    try:
-        sheets_service = SheetsService()
-        logger.info("✅ Google Sheets подключен")
-    except Exception as e:
-        logger.error(f"❌ Sheets: {e}")
+    snapshot_service = SnapshotService(os.getenv("SNAPSHOT_PATH", "entries_snapshot.json"))
+    await restore_snapshot()
     
     try:
         clients_service = ClientsService()
@@ -51,7 +78,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Clients: {e}")
     
+    # Авторизация Sheets и первая сверка идут в фоне, сервис отвечает сразу
     sync_task = asyncio.create_task(background_sync())
+    startup_metrics["ready_ms"] = elapsed_ms()
+    logger.info(f"⏱ Готов к работе за {startup_metrics['ready_ms']} мс")
     
     yield
     
@@ -87,26 +117,116 @@ async def log_cors(request: Request, call_next):
     origin = request.headers.get("origin")
     logger.info(f"Request: {request.method} {request.url.path} from origin: {origin}")
     response = await call_next(request)
+    mark_first_byte("http")
     logger.info(f"Response headers: {dict(response.headers)}")
     return response
 
+async def restore_snapshot():
+    """Восстановление последних данных из файла или Redis при старте"""
+    global cached_entries, redis_snapshot_dump
+    
+    source = "file"
+    data = snapshot_service.load() if snapshot_service else None
+    
+    if data is None and redis_client:
+        try:
+            cached = await redis_client.get(SNAPSHOT_KEY)
+            if cached:
+                data = json.loads(cached)
+                redis_snapshot_dump = cached
+                source = "redis"
+        except Exception as e:
+            logger.error(f"Ошибка Redis: {e}")
+    
+    if data is None:
+        logger.info("Снапшот не найден, ждём первую синхронизацию")
+        return
+    
+    cached_entries = data
+    startup_metrics["snapshot_source"] = source
+    startup_metrics["snapshot_periods"] = len(data)
+    
+    if redis_client:
+        try:
+            await redis_client.set("entries", json.dumps(data), ex=300)
+        except Exception as e:
+            logger.error(f"Ошибка Redis: {e}")
+    
+    logger.info(f"✅ Снапшот ({source}): {len(data)} периодов")
+
+async def connect_sheets() -> bool:
+    global sheets_service
+    
+    try:
+        sheets_service = await asyncio.to_thread(SheetsService)
+        if startup_metrics["sheets_ready_ms"] is None:
+            startup_metrics["sheets_ready_ms"] = elapsed_ms()
+        logger.info(f"✅ Google Sheets подключен ({startup_metrics['sheets_ready_ms']} мс)")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Sheets: {e}")
+        return False
+
+async def wait_synced() -> bool:
+    """Ожидание первой сверки с Sheets (с таймаутом)"""
+    try:
+        await asyncio.wait_for(sheets_synced.wait(), timeout=SYNC_WAIT_TIMEOUT)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
 async def background_sync():
+    retry_delay = 5
     while True:
         try:
-            await asyncio.sleep(5)
+            if not sheets_service:
+                if not await connect_sheets():
+                    # Экспоненциальная задержка между попытками авторизации
+                    await asyncio.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, SHEETS_RETRY_MAX)
+                    continue
             await sync_data()
+            await asyncio.sleep(5)
         except asyncio.CancelledError:
             break
         except Exception as e:
             logger.error(f"Ошибка синхронизации: {e}")
 
+async def store_data(data: Dict):
+    """Обновление кэша в памяти, Redis и снапшота"""
+    global cached_entries, redis_snapshot_dump
+    cached_entries = data
+    
+    if redis_client:
+        try:
+            dump = json.dumps(data)
+            await redis_client.set("entries", dump, ex=300)
+            # Непротухающий снапшот перезаписываем только при изменениях
+            if dump != redis_snapshot_dump:
+                await redis_client.set(SNAPSHOT_KEY, dump)
+                redis_snapshot_dump = dump
+        except Exception as e:
+            logger.error(f"Ошибка Redis: {e}")
+    
+    if snapshot_service:
+        await asyncio.to_thread(snapshot_service.save, data)
+
 async def sync_data():
-    if not sheets_service or not redis_client:
+    if not sheets_service:
         return
     
     try:
-        data = sheets_service.read_sheet()
-        await redis_client.set("entries", json.dumps(data), ex=300)
+        data = await asyncio.to_thread(sheets_service.read_sheet)
+        if not data and cached_entries:
+            # read_sheet возвращает {} при ошибке — не затираем снапшот
+            logger.warning("Пустой ответ Sheets, оставляем снапшот")
+            return
+        
+        await store_data(data)
+        if startup_metrics["first_sync_ms"] is None:
+            startup_metrics["first_sync_ms"] = elapsed_ms()
+            logger.info(f"⏱ Первая сверка с Sheets: {startup_metrics['first_sync_ms']} мс")
+        sheets_synced.set()
         
         if active_connections:
             message = {"type": "sync", "data": data}
@@ -122,23 +242,55 @@ async def sync_data():
     except Exception as e:
         logger.error(f"Ошибка синхронизации: {e}")
 
-async def get_cached_data() -> Dict:
-    if not redis_client:
-        return {}
+async def get_cached_data() -> Optional[Dict]:
+    """Текущие данные; None, если снапшота нет и первая сверка не успела"""
+    if cached_entries is not None:
+        return cached_entries
     
-    try:
-        cached = await redis_client.get("entries")
-        if cached:
-            return json.loads(cached)
-    except Exception as e:
-        logger.error(f"Ошибка Redis: {e}")
+    if redis_client:
+        try:
+            cached = await redis_client.get("entries")
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.error(f"Ошибка Redis: {e}")
+    
+    # Холодный старт без снапшота: ждём первую сверку, пустые данные не отдаём
+    if await wait_synced():
+        return cached_entries
     
-    if sheets_service:
-        data = sheets_service.read_sheet()
-        await redis_client.set("entries", json.dumps(data), ex=300)
-        return data
+    return None
+
+async def bulk_add_entries(raw_entries: List) -> List[Dict]:
+    """Массовое добавление: одна вставка в Sheets, одна синхронизация"""
+    results: List[Dict] = [{} for _ in raw_entries]
+    entries, positions = [], []
     
-    return {}
+    # Каждая запись проверяется BulkEntry: некорректная отклоняется отдельно
+    for i, raw in enumerate(raw_entries):
+        try:
+            entries.append(BulkEntry.model_validate(raw).model_dump(exclude_none=True))
+            positions.append(i)
+        except ValidationError as e:
+            results[i] = {"index": i, "success": False, "row_idx": -1, "error": f"Некорректная запись: {e.errors()[0]['msg']}"}
+    
+    if entries:
+        pushed = await asyncio.to_thread(sheets_service.push_rows, entries)
+        for i, result in zip(positions, pushed):
+            results[i] = {**result, "index": i}
+    
+    if any(r["success"] for r in results):
+        await sync_data()
+    return results
+
+class BulkEntry(BaseModel):
+    date: str
+    symbols: str = ""
+    amount: Optional[float] = None
+    salary: Optional[float] = None
+
+class BulkAddRequest(BaseModel):
+    entries: List[BulkEntry]
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -148,7 +300,9 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         data = await get_cached_data()
-        await websocket.send_json({"type": "init", "data": data})
+        if data is not None:
+            await websocket.send_json({"type": "init", "data": data})
+            mark_first_byte("ws")
         
         while True:
             message = await websocket.receive_json()
@@ -156,25 +310,41 @@ async def websocket_endpoint(websocket: WebSocket):
             
             if msg_type == "ping":
                 await websocket.send_json({"type": "pong"})
+                continue
+            
+            # Изменения только после первой сверки: row_idx снапшота могут быть устаревшими
+            if msg_type in ("add_entry", "bulk_add", "update_entry", "delete_entry") and not await wait_synced():
+                await websocket.send_json({
+                    "type": "error",
+                    "error": "Sheets service unavailable",
+                    "message": message
+                })
+                continue
             
             elif msg_type == "add_entry":
                 entry_data = message.get("data")
-                if sheets_service:
-                    row_idx = sheets_service.push_row(entry_data)
-                    await sync_data()
-                    await websocket.send_json({"type": "entry_added", "row_idx": row_idx, "success": True})
+                row_idx = sheets_service.push_row(entry_data)
+                await sync_data()
+                await websocket.send_json({"type": "entry_added", "row_idx": row_idx, "success": True})
+            
+            elif msg_type == "bulk_add":
+                raw_entries = message.get("entries")
+                results = await bulk_add_entries(raw_entries if isinstance(raw_entries, list) else [])
+                await websocket.send_json({
+                    "type": "bulk_added",
+                    "results": results,
+                    "success": all(r["success"] for r in results)
+                })
             
             elif msg_type == "update_entry":
-                if sheets_service:
-                    sheets_service.update_row(message.get("idx"), message.get("symbols"), message.get("amount"))
-                    await sync_data()
-                    await websocket.send_json({"type": "entry_updated", "success": True})
+                sheets_service.update_row(message.get("idx"), message.get("symbols"), message.get("amount"))
+                await sync_data()
+                await websocket.send_json({"type": "entry_updated", "success": True})
             
             elif msg_type == "delete_entry":
-                if sheets_service:
-                    sheets_service.delete_row(message.get("idx"))
-                    await sync_data()
-                    await websocket.send_json({"type": "entry_deleted", "success": True})
+                sheets_service.delete_row(message.get("idx"))
+                await sync_data()
+                await websocket.send_json({"type": "entry_deleted", "success": True})
             
     except WebSocketDisconnect:
         active_connections.discard(websocket)
@@ -193,14 +363,26 @@ async def health_check():
         "status": "healthy" if (redis_client and sheets_service) else "degraded",
         "redis": "ok" if redis_client else "error",
         "sheets": "ok" if sheets_service else "error",
-        "connections": len(active_connections)
+        "synced": sheets_synced.is_set(),
+        "connections": len(active_connections),
+        "startup": startup_metrics
     }
 
 @app.get("/api/entries")
 async def get_entries():
     data = await get_cached_data()
+    if data is None:
+        raise HTTPException(status_code=503, detail="Data not loaded yet")
     return {"data": data}
 
+@app.post("/api/entries/bulk")
+async def bulk_add(request: BulkAddRequest):
+    if not await wait_synced():
+        raise HTTPException(status_code=503, detail="Sheets service unavailable")
+    entries = [e.model_dump(exclude_none=True) for e in request.entries]
+    results = await bulk_add_entries(entries)
+    return {"success": all(r["success"] for r in results), "results": results}
+
 @app.get("/api/clients")
 async def get_clients():
     if not clients_service:
@@ -13,6 +13,7 @@ logger = logging.getLogger(__name__)
 DATE_FMT = "%d.%m.%Y"
 DATE_RX = re.compile(r"\d{2}\.\d{2}\.\d{4}$")
 HEADER_ROWS = 4
+SERIAL_EPOCH = date(1899, 12, 30)
 
 class SheetsService:
     def __init__(self, credentials_path: str = "credentials.json"):
@@ -104,16 +105,7 @@ class SheetsService:
             ]
             
             col = self.sheet.col_values(1)[HEADER_ROWS:]
-            ins = HEADER_ROWS
-            
-            for i, v in enumerate(col, start=HEADER_ROWS + 1):
-                try:
-                    if self.pdate(v) <= nd:
-                        ins = i
-                    else:
-                        break
-                except:
-                    continue
+            ins = self.insert_position(col, nd)
             
             self.sheet.insert_row(row, ins + 1, value_input_option="USER_ENTERED")
             logger.info(f"✅ Добавлена строка {ins + 1}")
@@ -123,6 +115,120 @@ class SheetsService:
             logger.error(f"Ошибка добавления строки: {e}")
             return -1
     
+    def insert_position(self, col: List[str], nd: date) -> int:
+        """Номер строки, после которой вставляется запись с датой nd"""
+        ins = HEADER_ROWS
+        
+        for i, v in enumerate(col, start=HEADER_ROWS + 1):
+            try:
+                if self.pdate(v) <= nd:
+                    ins = i
+                else:
+                    break
+            except:
+                continue
+        
+        return ins
+    
+    def number_value(self, v) -> Optional[float]:
+        if v is None or v == "":
+            return None
+        return self.safe_float(str(v))
+    
+    def row_cells(self, entry: Dict, nd: date) -> Dict:
+        """Строка для updateCells: дата как серийное число с форматом DATE_FMT"""
+        cells = [{
+            "userEnteredValue": {"numberValue": (nd - SERIAL_EPOCH).days},
+            "userEnteredFormat": {"numberFormat": {"type": "DATE", "pattern": "dd.mm.yyyy"}},
+        }, {
+            "userEnteredValue": {"stringValue": entry.get("symbols", "")},
+        }]
+        for key in ("amount", "salary"):
+            v = self.number_value(entry.get(key))
+            cells.append({"userEnteredValue": {"numberValue": v}} if v is not None else {})
+        return {"values": cells}
+    
+    def push_rows(self, entries: List[Dict]) -> List[Dict]:
+        """Массовое добавление строк одним слиянием по дате (один batchUpdate)"""
+        results = [{"index": i, "success": False, "row_idx": -1} for i in range(len(entries))]
+        
+        parsed = []
+        for i, entry in enumerate(entries):
+            try:
+                nd = self.pdate(entry["date"])
+            except Exception as e:
+                results[i]["error"] = f"Некорректная дата: {e}"
+                continue
+            
+            # read_sheet пропускает строки без суммы и зарплаты
+            if self.number_value(entry.get("amount")) is None and self.number_value(entry.get("salary")) is None:
+                results[i]["error"] = "Нет суммы или зарплаты"
+                continue
+            
+            parsed.append((nd, i))
+        
+        if not parsed:
+            return results
+        
+        # Стабильная сортировка: записи одной даты сохраняют исходный порядок
+        parsed.sort(key=lambda p: p[0])
+        
+        try:
+            col = self.sheet.col_values(1)[HEADER_ROWS:]
+            
+            # Группируем по позиции вставки в исходном листе
+            groups: Dict[int, List[int]] = defaultdict(list)
+            for nd, i in parsed:
+                groups[self.insert_position(col, nd) + 1].append(i)
+            
+            # Вставляем пустые строки снизу вверх, чтобы позиции не сдвигались
+            requests = []
+            for start in sorted(groups, reverse=True):
+                requests.append({
+                    "insertDimension": {
+                        "range": {
+                            "sheetId": self.sheet.id,
+                            "dimension": "ROWS",
+                            "startIndex": start - 1,
+                            "endIndex": start - 1 + len(groups[start]),
+                        },
+                        "inheritFromBefore": False,
+                    }
+                })
+            
+            # Заполняем строки по итоговым номерам с учётом вставок выше
+            dates = {i: nd for nd, i in parsed}
+            shift = 0
+            for start in sorted(groups):
+                first = start + shift
+                rows = []
+                for offset, i in enumerate(groups[start]):
+                    rows.append(self.row_cells(entries[i], dates[i]))
+                    results[i]["row_idx"] = first + offset
+                requests.append({
+                    "updateCells": {
+                        "start": {"sheetId": self.sheet.id, "rowIndex": first - 1, "columnIndex": 0},
+                        "rows": rows,
+                        "fields": "userEnteredValue,userEnteredFormat.numberFormat",
+                    }
+                })
+                shift += len(rows)
+            
+            # Вставка и запись значений атомарны: при ошибке лист не меняется
+            self.sheet.spreadsheet.batch_update({"requests": requests})
+            
+            for _, i in parsed:
+                results[i]["success"] = True
+            logger.info(f"✅ Добавлено строк: {len(parsed)} ({len(groups)} блоков)")
+            
+        except Exception as e:
+            logger.error(f"Ошибка массового добавления: {e}")
+            for _, i in parsed:
+                results[i]["row_idx"] = -1
+                results[i]["error"] = str(e)
+        
+        return results
+    
     def update_row(self, idx: int, symbols: str, amount: float):
         """Обновление строки"""
         try:
@@ -0,0 +1,44 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class SnapshotService:
+    """Локальный снапшот последних данных из Sheets для быстрого старта"""
+
+    def __init__(self, snapshot_path: str = "entries_snapshot.json"):
+        self.snapshot_path = snapshot_path
+        self.last_dump: Optional[str] = None
+
+    def load(self) -> Optional[Dict[str, List[Dict]]]:
+        """Загрузка снапшота из файла"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            data = json.loads(raw)
+            self.last_dump = raw
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Ошибка чтения снапшота: {e}")
+            return None
+
+    def save(self, data: Dict[str, List[Dict]]) -> bool:
+        """Атомарное сохранение снапшота, если данные изменились"""
+        dump = json.dumps(data, ensure_ascii=False)
+        if dump == self.last_dump:
+            return False
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(dump)
+            os.replace(tmp_path, self.snapshot_path)
+            self.last_dump = dump
+            return True
+        except Exception as e:
+            logger.error(f"Ошибка сохранения снапшота: {e}")
+            return False
@@ -2,7 +2,7 @@ import { useState, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { Box, Card, Typography, Stack, IconButton, TextField, Button, alpha, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, Chip } from '@mui/material'
 import { ArrowBack, Check, Delete, Preview } from '@mui/icons-material'
-import { useAppStore } from '../store/appStore'
+import { useAppStore, BulkAddResult } from '../store/appStore'
 import { haptics } from '../utils/haptics'
 
 interface ParsedEntry {
@@ -11,9 +11,15 @@ interface ParsedEntry {
   valid: boolean
 }
 
+interface FailedEntry {
+  name: string
+  amount: number
+  error: string
+}
+
 export default function BulkAddEntry() {
   const navigate = useNavigate()
-  const { addEntry, syncData } = useAppStore()
+  const { addEntries, syncData } = useAppStore()
   
   const [bulkText, setBulkText] = useState('')
   const [date, setDate] = useState(() => {
@@ -22,6 +28,7 @@ export default function BulkAddEntry() {
   })
   const [previewing, setPreviewing] = useState(false)
   const [isAdding, setIsAdding] = useState(false)
+  const [failedEntries, setFailedEntries] = useState<FailedEntry[]>([])
   
   const textareaRef = useRef<HTMLTextAreaElement>(null)
 
@@ -70,23 +77,32 @@ export default function BulkAddEntry() {
     }
 
     setIsAdding(true)
+    setFailedEntries([])
     haptics.success()
     
     const [year, month, day] = date.split('-')
     const formattedDate = `${day}.${month}.${year}`
 
     try {
-      for (const entry of validEntries) {
-        await addEntry({
-          date: formattedDate,
-          symbols: entry.name,
-          amount: entry.amount
-        })
-        // Небольшая задержка для стабильности
-        await new Promise(resolve => setTimeout(resolve, 100))
-      }
+      const results: BulkAddResult[] = await addEntries(validEntries.map(entry => ({
+        date: formattedDate,
+        symbols: entry.name,
+        amount: entry.amount
+      })))
       
       await syncData()
+      
+      // Оставляем в поле только не добавленные строки, чтобы их можно было повторить
+      const failed = results
+        .filter(r => !r.success)
+        .map(r => ({ ...validEntries[r.index], error: r.error || 'Ошибка' }))
+      if (failed.length > 0) {
+        setFailedEntries(failed)
+        setBulkText(failed.map(e => `${e.amount} ${e.name}`).join('\n'))
+        haptics.error()
+        return
+      }
+      
       haptics.success()
       navigate(`/day/${year}/${month}/${day}`)
     } catch (error) {
@@ -248,6 +264,22 @@ export default function BulkAddEntry() {
           </Stack>
         </Card>
 
+        {/* Ошибки добавления */}
+        {failedEntries.length > 0 && (
+          <Card sx={{ p: 2.5, bgcolor: alpha('#ff0000', 0.05) }}>
+            <Typography variant="h6" fontWeight={700} mb={1} color="error">
+              Не добавлено: {failedEntries.length}
+            </Typography>
+            <Stack spacing={0.5}>
+              {failedEntries.map((entry, idx) => (
+                <Typography key={idx} variant="caption" fontSize="0.75rem">
+                  {entry.name} — ${entry.amount.toLocaleString()}: {entry.error}
+                </Typography>
+              ))}
+            </Stack>
+          </Card>
+        )}
+
         {/* Превью */}
         {previewing && parsedEntries.length > 0 && (
           <Card sx={{ p: 2.5 }}>
@@ -10,6 +10,13 @@ interface Entry {
   salary?: number
 }
 
+export interface BulkAddResult {
+  index: number
+  success: boolean
+  row_idx: number
+  error?: string
+}
+
 interface AppState {
   entries: Record<string, Entry[]>
   ws: WebSocket | null
@@ -20,6 +27,7 @@ interface AppState {
   connectWebSocket: () => void
   syncData: () => Promise<void>
   addEntry: (entry: Entry) => Promise<void>
+  addEntries: (entries: Entry[]) => Promise<BulkAddResult[]>
   updateEntry: (period: string, rowIdx: number, entry: Entry) => Promise<void>
   deleteEntry: (period: string, rowIdx: number) => Promise<void>
   addPendingAction: (action: any) => void
@@ -56,6 +64,10 @@ export const useAppStore = create<AppState>()(
               
               if (message.type === 'init' || message.type === 'sync') {
                 set({ entries: message.data })
+              } else if (message.type === 'error' && message.message) {
+                // Сервер не смог применить действие — возвращаем его в очередь
+                console.error('❌ Действие не применено:', message.error)
+                get().addPendingAction(message.message)
               }
             } catch (error) {
               console.error('❌ Ошибка парсинга WS сообщения:', error)
@@ -117,6 +129,31 @@ export const useAppStore = create<AppState>()(
         }
       },
 
+      addEntries: async (entries) => {
+        const { isOnline } = get()
+        
+        if (isOnline) {
+          const response = await fetch(`${API_URL}/api/entries/bulk`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ entries })
+          })
+          
+          if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`)
+          }
+          
+          const result = await response.json()
+          if (!result.success) {
+            console.error('❌ Часть записей не добавлена:', result.results.filter((r: BulkAddResult) => !r.success))
+          }
+          return result.results
+        }
+        
+        get().addPendingAction({ type: 'bulk_add', entries })
+        return []
+      },
+
       updateEntry: async (period, rowIdx, entry) => {
         const { ws, isOnline } = get()
         